@@ -120,13 +120,18 @@ def append_initrd(initrd, files):
     ks_initrd = tempfile.mktemp(prefix="lmc-ks-", suffix=".img")
     mkcpio(ks_dir, ks_initrd)
     shutil.rmtree(ks_dir)
-    with open(qemu_initrd, "ab") as initrd_fp:
+    # Splice the cpio onto the end of the initrd in the kernel with sendfile,
+    # skipping the user-space copy entirely
+    with open(qemu_initrd, "r+b") as initrd_fp:
         with open(ks_initrd, "rb") as ks_fp:
-            while True:
-                data = ks_fp.read(1024**2)
-                if not data:
+            initrd_fp.seek(0, 2)
+            count = os.fstat(ks_fp.fileno()).st_size
+            offset = 0
+            while offset < count:
+                sent = os.sendfile(initrd_fp.fileno(), ks_fp.fileno(), offset, count - offset)
+                if sent == 0:
                     break
-                initrd_fp.write(data)
+                offset += sent
     os.unlink(ks_initrd)
 
     return qemu_initrd
@@ -54,7 +54,7 @@ class LoraxTemplate(object):
 
         try:
             textbuf = template.render(**variables)
-        except:
+        except Exception:
             logger.error("Problem rendering %s (%s):", template_file, variables)
             logger.error(text_error_template().render())
             raise
@@ -92,17 +92,32 @@ def brace_expand(s):
             for alt in brace_expand(prefix+choice+suffix):
                 yield alt
 
+def _has_magic(pathname):
+    '''Does the pathname contain any glob metacharacters?'''
+    return any(c in pathname for c in '*?[')
+
 def rglob(pathname, root="/", fatal=False):
     seen = set()
     rootlen = len(root)+1
-    for f in glob.iglob(joinpaths(root, pathname)):
-        if f not in seen:
+    if not _has_magic(pathname):
+        # Literal pattern - no need to scan any directories to expand it
+        f = joinpaths(root, pathname)
+        if os.path.lexists(f):
             seen.add(f)
             yield f[rootlen:] # remove the root to produce relative path
+    else:
+        for f in glob.iglob(joinpaths(root, pathname)):
+            if f not in seen:
+                seen.add(f)
+                yield f[rootlen:] # remove the root to produce relative path
     if fatal and not seen:
         raise IOError("nothing matching %s in %s" % (pathname, root))
 
 def rexists(pathname, root=""):
+    # A literal path needs just one stat, not a directory scan
+    if not _has_magic(pathname):
+        return os.path.lexists(joinpaths(root, pathname))
+
     # Generator is always True, even with no values;
     # bool(rglob(...)) won't work here.
     for _path in rglob(pathname, root):
@@ -138,11 +153,37 @@ class TemplateRunner(object):
         self.builtins = builtins or {}
         self.defaults = defaults or {}
 
+        # Map the command names to their bound methods once - the public
+        # methods are the template commands
+        self._commands = {}
+        for name in dir(self):
+            if name.startswith('_') or name == 'run':
+                continue
+            f = getattr(self, name)
+            if isinstance(f, collections.abc.Callable):
+                self._commands[name] = f
+
+    @property
+    def defaults(self):
+        return self._defaults
+
+    @defaults.setter
+    def defaults(self, value):
+        self._defaults = value
+        # The merged defaults are rebuilt on the next run()
+        self._alldefaults = None
 
     def run(self, templatefile, **variables):
-        for k,v in list(self.defaults.items()) + list(self.builtins.items()):
+        if self._alldefaults is None:
+            # Merge the defaults and builtins once; defaults take precedence
+            self._alldefaults = dict(self.builtins)
+            self._alldefaults.update(self._defaults)
+        for k,v in self._alldefaults.items():
             variables.setdefault(k,v)
-        logger.debug("executing %s with variables=%s", templatefile, variables)
+        if logger.isEnabledFor(logging.DEBUG):
+            # one log record for all the variables, in a stable order
+            logger.debug("executing %s with variables:\n  %s", templatefile,
+                         "\n  ".join("%s=%s" % (k, variables[k]) for k in sorted(variables)))
         self.templatefile = templatefile
         t = LoraxTemplate(directories=[self.templatedir])
         commands = t.parse(templatefile, variables)
@@ -151,8 +192,10 @@ class TemplateRunner(object):
 
     def _run(self, parsed_template):
         logger.info("running %s", self.templatefile)
+        debug_on = logger.isEnabledFor(logging.DEBUG)
         for (num, line) in enumerate(parsed_template,1):
-            logger.debug("template line %i: %s", num, " ".join(line))
+            if debug_on:
+                logger.debug("template line %i: %s", num, " ".join(line))
             skiperror = False
             (cmd, args) = (line[0], line[1:])
             # Following Makefile convention, if the command is prefixed with
@@ -162,8 +205,8 @@ class TemplateRunner(object):
                 skiperror = True
             try:
                 # grab the method named in cmd and pass it the given arguments
-                f = getattr(self, cmd, None)
-                if cmd[0] == '_' or cmd == 'run' or not isinstance(f, collections.abc.Callable):
+                f = self._commands.get(cmd)
+                if f is None:
                     raise ValueError("unknown command %s" % cmd)
                 f(*args)
             except Exception: # pylint: disable=broad-except
@@ -221,6 +264,10 @@ class LoraxTemplateRunner(TemplateRunner):
                                         templatedir=None, defaults=None):
         self.inroot = inroot
         self.outroot = outroot
+        # joinpaths(root, path) is just root + "/" + path, and _in/_out run
+        # for nearly every template command - precompute the prefixes
+        self._in_prefix = inroot + os.path.sep
+        self._out_prefix = outroot + os.path.sep
         self.dbo = dbo
         builtins = DataHolder(exists=lambda p: rexists(p, root=inroot),
                               glob=lambda g: list(rglob(g, root=inroot)))
@@ -230,9 +277,9 @@ class LoraxTemplateRunner(TemplateRunner):
         # TODO: set up custom logger with a filter to add line info
 
     def _out(self, path):
-        return joinpaths(self.outroot, path)
+        return self._out_prefix + path
     def _in(self, path):
-        return joinpaths(self.inroot, path)
+        return self._in_prefix + path
 
     def _filelist(self, *pkgs):
         """ Return the list of files in the packages """
@@ -317,7 +364,7 @@ class LoraxTemplateRunner(TemplateRunner):
 
         srcdir = args[-2]
         destfile = args[-1]
-        if not os.path.isdir(self._in(srcdir)) or not os.listdir(self._in(srcdir)):
+        if not os.path.isdir(self._in(srcdir)) or not any(os.scandir(self._in(srcdir))):
             return
 
         compression = "xz"
@@ -344,9 +391,7 @@ class LoraxTemplateRunner(TemplateRunner):
             mkdir /images
         '''
         for d in dirs:
-            d = self._out(d)
-            if not isdir(d):
-                os.makedirs(d)
+            os.makedirs(self._out(d), exist_ok=True)
 
     def replace(self, pat, repl, *fileglobs):
         '''
@@ -358,6 +403,7 @@ class LoraxTemplateRunner(TemplateRunner):
             replace @VERSION@ ${product.version} /boot/grub.conf /boot/isolinux.cfg
         '''
         match = False
+        pat = re.compile(pat) # compile once for all the files
         for g in fileglobs:
             for f in rglob(self._out(g)):
                 match = True
@@ -390,9 +436,7 @@ class LoraxTemplateRunner(TemplateRunner):
           Example:
             treeinfo images-${kernel.arch} boot.iso images/boot.iso
         '''
-        if section not in self.results.treeinfo:
-            self.results.treeinfo[section] = dict()
-        self.results.treeinfo[section][key] = " ".join(valuetoks)
+        self.results.treeinfo.setdefault(section, dict())[key] = " ".join(valuetoks)
 
     def installkernel(self, section, src, dest):
         '''
@@ -514,14 +558,13 @@ class LoraxTemplateRunner(TemplateRunner):
             remove ${f}
             %endfor
         '''
-        cmd = cmdlist
-        logger.debug('running command: %s', cmd)
-        if cmd[0].startswith("--chdir="):
+        logger.debug('running command: %s', cmdlist)
+        if cmdlist[0].startswith("--chdir="):
             logger.error("--chdir is no longer supported for runcmd.")
             raise ValueError("--chdir is no longer supported for runcmd.")
 
         try:
-            stdout = runcmd_output(cmd)
+            stdout = runcmd_output(cmdlist)
             if stdout:
                 logger.debug('command output:\n%s', stdout)
             logger.debug("command finished successfully")
@@ -615,7 +658,9 @@ class LoraxTemplateRunner(TemplateRunner):
             filepaths = [f.lstrip('/') for f in self._filelist(p)]
             # TODO: also remove directories that aren't owned by anything else
             if filepaths:
-                logger.debug("removepkg %s: %ikb", p, self._getsize(*filepaths)/1024)
+                # don't stat all the files for _getsize unless it will be logged
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("removepkg %s: %ikb", p, self._getsize(*filepaths)/1024)
                 self.remove(*filepaths)
             else:
                 logger.debug("removepkg %s: no files to remove!", p)
@@ -698,9 +743,11 @@ class LoraxTemplateRunner(TemplateRunner):
             remove_files = matches
         # remove the files
         if remove_files:
-            logger.debug("removefrom %s: removed %i/%i files, %ikb/%ikb", cmd,
-                             len(remove_files), len(filelist),
-                             self._getsize(*remove_files)/1024, self._getsize(*filelist)/1024)
+            # don't stat all the files for _getsize unless it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("removefrom %s: removed %i/%i files, %ikb/%ikb", cmd,
+                                 len(remove_files), len(filelist),
+                                 self._getsize(*remove_files)/1024, self._getsize(*filelist)/1024)
             self.remove(*remove_files)
         else:
             logger.debug("removefrom %s: no files to remove!", cmd)
@@ -50,8 +50,9 @@ def touch(fname):
 
 
 def replace(fname, find, sub):
+    # find can be a pattern string or an already compiled regex
     fin = fileinput.input(fname, inplace=1)
-    pattern = re.compile(find)
+    pattern = find if isinstance(find, re.Pattern) else re.compile(find)
 
     for line in fin:
         line = pattern.sub(sub, line)
@@ -24,14 +24,13 @@ import os, re
 from os.path import basename
 from shutil import copytree, copy2
 from subprocess import CalledProcessError
-from pathlib import Path
 import itertools
 
 from pylorax.sysutils import joinpaths, remove
 from pylorax.base import DataHolder
 from pylorax.ltmpl import LoraxTemplateRunner
 import pylorax.imgutils as imgutils
-from pylorax.executils import runcmd, runcmd_output, execWithCapture
+from pylorax.executils import runcmd, runcmd_output, execWithCapture, startProgram
 
 templatemap = {
     'i386':    'x86.tmpl',
@@ -172,9 +171,11 @@ class RuntimeBuilder(object):
         # For ELF files, gather them into a list and we'll check them all at
         # the end. For files with a #!, check them as we go
         elf_files = []
-        usr_bin = Path(self.vars.root + '/usr/bin')
-        usr_sbin = Path(self.vars.root + '/usr/sbin')
-        for path in (str(x) for x in itertools.chain(usr_bin.iterdir(), usr_sbin.iterdir()) \
+        # scandir's DirEntry.is_file uses the directory entry type info,
+        # saving a stat() call per file
+        usr_bin = os.scandir(self.vars.root + '/usr/bin')
+        usr_sbin = os.scandir(self.vars.root + '/usr/sbin')
+        for path in (x.path for x in itertools.chain(usr_bin, usr_sbin) \
                      if x.is_file()):
             with open(path, "rb") as f:
                 magic = f.read(4)
@@ -285,10 +286,17 @@ class TreeBuilder(object):
         self.add_template_vars = add_template_vars or {}
         self.templatedir = templatedir
         self.treeinfo_data = None
+        self._kernels = None
 
     @property
     def kernels(self):
-        return findkernels(root=self.vars.inroot)
+        """List of the kernels in the tree, scanning the boot directory only once.
+
+        The cache is invalidated by rebuild_initrds, which changes the tree.
+        """
+        if self._kernels is None:
+            self._kernels = findkernels(root=self.vars.inroot)
+        return self._kernels
 
     def rebuild_initrds(self, add_args=None, backup="", prefix=""):
         '''Rebuild all the initrds in the tree. If backup is specified, each
@@ -308,6 +316,11 @@ class TreeBuilder(object):
         if not self.kernels:
             raise Exception("No kernels found, cannot rebuild_initrds")
 
+        logger.info("dracut warnings about /proc are safe to ignore")
+
+        # The kernels are independent, so run the dracut processes in
+        # parallel and wait for them all to finish
+        procs = []
         for kernel in self.kernels:
             if prefix:
                 idir = os.path.dirname(kernel.path)
@@ -319,14 +332,25 @@ class TreeBuilder(object):
                 # Construct an initrd from the kernel name
                 outfile = kernel.path.replace("vmlinuz-", "initrd-") + ".img"
             logger.info("rebuilding %s", outfile)
-            logger.info("dracut warnings about /proc are safe to ignore")
 
             if backup:
                 initrd = joinpaths(self.vars.inroot, outfile)
                 if os.path.exists(initrd):
                     os.rename(initrd, initrd + backup)
             cmd = dracut + [outfile, kernel.version]
-            runcmd(cmd, root=self.vars.inroot)
+            procs.append((cmd, startProgram(cmd, root=self.vars.inroot,
+                                            universal_newlines=True)))
+
+        for cmd, proc in procs:
+            stdout, _stderr = proc.communicate()
+            if stdout:
+                for line in stdout.splitlines():
+                    logger.debug(line)
+            if proc.returncode != 0:
+                raise CalledProcessError(proc.returncode, cmd, stdout)
+
+        # The initrds changed, so rescan the tree on the next access
+        self._kernels = None
 
     def build(self):
         templatefile = templatemap[self.vars.arch.basearch]
@@ -377,24 +401,32 @@ class TreeBuilder(object):
 
 #### TreeBuilder helper functions
 
+# To find possible flavors, awk '/BuildKernel/ { print $4 }' kernel.spec
+_FLAVORS = ('debug', 'PAE', 'PAEdebug', 'smp', 'xen', 'lpae')
+# The flavor list is static, so compile the kernel filename regex just once
+_KERNEL_RE = re.compile(r"vmlinuz-(?P<version>.+?\.(?P<arch>[a-z0-9_]+)"
+                        r"(.(?P<flavor>{0}))?)$".format("|".join(_FLAVORS)))
+
 def findkernels(root="/", kdir="boot"):
-    # To find possible flavors, awk '/BuildKernel/ { print $4 }' kernel.spec
-    flavors = ('debug', 'PAE', 'PAEdebug', 'smp', 'xen', 'lpae')
-    kre = re.compile(r"vmlinuz-(?P<version>.+?\.(?P<arch>[a-z0-9_]+)"
-                     r"(.(?P<flavor>{0}))?)$".format("|".join(flavors)))
+    # one pass over the boot dir - collect the kernels and the candidate
+    # initrd/initramfs/etc. images
     kernels = []
-    bootfiles = os.listdir(joinpaths(root, kdir))
-    for f in bootfiles:
-        match = kre.match(f)
+    imgfiles = []
+    for f in os.listdir(joinpaths(root, kdir)):
+        match = _KERNEL_RE.match(f)
         if match:
             kernel = DataHolder(path=joinpaths(kdir, f))
             kernel.update(match.groupdict()) # sets version, arch, flavor
             kernels.append(kernel)
-
-    # look for associated initrd/initramfs/etc.
-    for kernel in kernels:
-        for f in bootfiles:
-            if f.endswith('-'+kernel.version+'.img'):
+        elif f.endswith('.img') and '-' in f:
+            imgfiles.append(f)
+
+    # associate the images with their kernels, building each version
+    # suffix only once instead of once per file
+    suffixes = [('-'+kernel.version+'.img', kernel) for kernel in kernels]
+    for f in imgfiles:
+        for suffix, kernel in suffixes:
+            if f.endswith(suffix):
                 imgtype, _rest = f.split('-',1)
                 # special backwards-compat case
                 if imgtype == 'initramfs':
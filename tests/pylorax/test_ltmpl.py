@@ -48,11 +48,20 @@ class TemplateFunctionsTestCase(unittest.TestCase):
         with self.assertRaises(IOError):
             list(rglob("einstein", "./tests/pylorax/blueprints", fatal=True))
 
+        # Literal patterns skip glob entirely, make sure the results match
+        self.assertEqual(list(rglob("chmod-cmd.tmpl", "./tests/pylorax/templates", fatal=False)), ["chmod-cmd.tmpl"])
+        with self.assertRaises(IOError):
+            list(rglob("einstein.tmpl", "./tests/pylorax/blueprints", fatal=True))
+
     def test_rexists(self):
         """Test rexists function"""
         self.assertTrue(rexists("chmod*tmpl", "./tests/pylorax/templates"))
         self.assertFalse(rexists("einstein", "./tests/pylorax/templates"))
 
+        # Literal paths take a stat-only shortcut, make sure it agrees
+        self.assertTrue(rexists("chmod-cmd.tmpl", "./tests/pylorax/templates"))
+        self.assertFalse(rexists("einstein.tmpl", "./tests/pylorax/templates"))
+
 class LoraxTemplateTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(self):
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 import io
+import re
 import unittest
 import tempfile
 import os
@@ -50,6 +51,12 @@ class SysUtilsTest(unittest.TestCase):
         with open(f.name) as fr:
             line = fr.readline()
         self.assertEqual(line, "A few words to apply ant eaters testing\n")
+
+        # A precompiled pattern works too
+        replace(f.name, re.compile("ant eaters"), "aardvarks")
+        with open(f.name) as fr:
+            line = fr.readline()
+        self.assertEqual(line, "A few words to apply aardvarks testing\n")
         os.unlink(f.name)
 
     @unittest.skipUnless(os.geteuid() == 0, "requires root privileges")
@@ -23,7 +23,8 @@ import unittest
 
 from pylorax import ArchData, DataHolder
 from pylorax.dnfbase import get_dnf_base_object
-from pylorax.treebuilder import RuntimeBuilder
+from pylorax.sysutils import joinpaths
+from pylorax.treebuilder import RuntimeBuilder, TreeBuilder, findkernels
 
 # TODO Put these into a common test library location
 @contextmanager
@@ -61,6 +62,46 @@ def makeFakeRPM(repo_dir, name, epoch, version, release, files=None, provides=No
         shutil.move(rpmfile, repo_dir)
 
 
+class FindKernelsTestCase(unittest.TestCase):
+    def _make_boot_files(self, root, files):
+        os.makedirs(joinpaths(root, "boot"), exist_ok=True)
+        for f in files:
+            open(joinpaths(root, "boot", f), "w").close()
+
+    def test_findkernels(self):
+        """Test finding kernels and their initrds in a boot directory"""
+        with tempfile.TemporaryDirectory(prefix="lorax.test.") as root_dir:
+            self._make_boot_files(root_dir, ["vmlinuz-5.1.20-300.fc30.x86_64",
+                                             "initramfs-5.1.20-300.fc30.x86_64.img",
+                                             "vmlinuz-5.1.20-300.fc30.x86_64.PAE",
+                                             "config-5.1.20-300.fc30.x86_64"])
+            kernels = sorted(findkernels(root=root_dir), key=lambda k: k.version)
+            self.assertEqual(len(kernels), 2)
+            self.assertEqual(kernels[0].version, "5.1.20-300.fc30.x86_64")
+            self.assertEqual(kernels[0].flavor, None)
+            self.assertEqual(kernels[0].initrd.path, "boot/initramfs-5.1.20-300.fc30.x86_64.img")
+            self.assertEqual(kernels[1].version, "5.1.20-300.fc30.x86_64.PAE")
+            self.assertEqual(kernels[1].flavor, "PAE")
+
+    def test_kernels_cached(self):
+        """Test that TreeBuilder.kernels only scans the boot directory once"""
+        with tempfile.TemporaryDirectory(prefix="lorax.test.") as root_dir:
+            self._make_boot_files(root_dir, ["vmlinuz-5.1.20-300.fc30.x86_64"])
+            product = DataHolder(name="Fedora", version="33", release="33",
+                                 variant="", bugurl="http://none", isfinal=True)
+            arch = ArchData(os.uname().machine)
+            tb = TreeBuilder(product, arch, inroot=root_dir, outroot=root_dir,
+                             runtime="squashfs.img", isolabel="test")
+            self.assertEqual(len(tb.kernels), 1)
+            # A kernel added after the first access isn't seen by the cache
+            self._make_boot_files(root_dir, ["vmlinuz-5.1.20-300.fc30.x86_64.PAE"])
+            self.assertIs(tb.kernels, tb.kernels)
+            self.assertEqual(len(tb.kernels), 1)
+            # Clearing the cache (as rebuild_initrds does) picks it up
+            tb._kernels = None
+            self.assertEqual(len(tb.kernels), 2)
+
+
 class InstallBrandingTestCase(unittest.TestCase):
     def install_branding(self, repo_dir, variant=None, skip_branding=False):
         """Run the _install_branding and return the names of the installed packages"""